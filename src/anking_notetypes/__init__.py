@@ -1,4 +1,6 @@
+from concurrent.futures import Future
 from pathlib import Path
+from typing import List, Optional
 
 from aqt import mw
 from aqt.gui_hooks import card_layout_will_show, profile_did_open
@@ -51,23 +53,33 @@ def maybe_show_notetypes_update_notice():
     if not mw.col:
         return
 
-    models_with_available_updates = (
-        NotetypesConfigWindow.models_with_available_updates()
-    )
-    if not models_with_available_updates:
+    # checking for updates is done in the background to not delay the profile opening
+    def task() -> List[Optional[str]]:
+        return [
+            NotetypesConfigWindow.model_version(model)
+            for model in NotetypesConfigWindow.models_with_available_updates()
+        ]
+
+    def on_done(versions_fut: Future) -> None:
+        show_notetypes_update_notice(versions_fut.result())
+
+    mw.taskman.run_in_background(task, on_done)
+
+
+def show_notetypes_update_notice(versions_with_available_updates: List[Optional[str]]):
+    # versions_with_available_updates are the current versions of the models
+    # for which updates are available
+    if not versions_with_available_updates:
         return
 
     conf = mw.addonManager.getConfig(ADDON_DIR_NAME)
     latest_notice_version = conf.get("latest_notified_note_type_version")
     if all(
-        NotetypesConfigWindow.model_version(model) == latest_notice_version
-        for model in models_with_available_updates
+        version == latest_notice_version for version in versions_with_available_updates
     ):
         return
 
-    conf["latest_notified_note_type_version"] = NotetypesConfigWindow.model_version(
-        models_with_available_updates[0]
-    )
+    conf["latest_notified_note_type_version"] = versions_with_available_updates[0]
 
     answer = askUserDialog(
         title="AnKing note types update",
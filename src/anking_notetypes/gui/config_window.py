@@ -1,24 +1,30 @@
 import re
 from collections import defaultdict
 from concurrent.futures import Future
-from typing import Any, Dict, List, Optional, Union
+from copy import deepcopy
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from aqt import mw
 from aqt.clayout import CardLayout
 from aqt.qt import QWidget
 from aqt.utils import askUser, showInfo, tooltip
 
+from .. import notetype_setting_definitions
 from ..ankiaddonconfig import ConfigManager, ConfigWindow
 from ..ankiaddonconfig.window import ConfigLayout
 from ..constants import ANKIHUB_NOTETYPE_RE, NOTETYPE_COPY_RE
-from ..notetype_setting import NotetypeSetting, NotetypeSettingException
+from ..notetype_setting import (
+    NotetypeSetting,
+    NotetypeSettingException,
+    update_model_settings,
+)
 from ..notetype_setting_definitions import (
     anking_notetype_model,
     anking_notetype_names,
     configurable_fields_for_notetype,
     general_settings,
     general_settings_defaults_dict,
-    setting_configs,
 )
 from ..utils import update_notetype_to_newest_version
 from .anking_widgets import AnkingIconsLayout, AnkiPalaceLayout, GithubLinkLayout
@@ -33,46 +39,82 @@ except:
 def ntss_for_model(model: "NotetypeDict") -> List[NotetypeSetting]:
 
     # returns all nts that are present on the notetype
-    result = []
-    for setting_config in setting_configs.values():
-        nts = NotetypeSetting.from_config(setting_config)
-        if nts.is_present(model):
-            result.append(nts)
+    return list(_ntss_for_templates(*_template_texts(model)))
+
+
+# which settings are present only depends on the template texts, so the result can be
+# cached on them (the hashes of the strings are cached by python, so lookups are cheap)
+@lru_cache(maxsize=64)
+def _ntss_for_templates(front: str, back: str, css: str) -> Tuple[NotetypeSetting, ...]:
+    model = {"tmpls": [{"qfmt": front, "afmt": back}], "css": css}
+    return tuple(nts for nts in _all_ntss().values() if nts.is_present(model))
+
 
-    return result
+def _template_texts(model: "NotetypeDict") -> Tuple[str, str, str]:
+    # the texts the settings are stored in
+    template = model["tmpls"][0]
+    return (template["qfmt"], template["afmt"], model["css"])
 
 
 def general_ntss() -> List[NotetypeSetting]:
-    result = []
-    for setting_name in general_settings:
-        result.append(NotetypeSetting.from_config(setting_configs[setting_name]))
-    return result
+    all_ntss = _all_ntss()
+    return [all_ntss[setting_name] for setting_name in general_settings]
+
+
+# the nts objects don't depend on the models, so they are only created once
+# (on first use and not on import to not slow down Anki's startup)
+@lru_cache(maxsize=None)
+def _all_ntss() -> Dict[str, NotetypeSetting]:
+    return {
+        setting_name: NotetypeSetting.from_config(setting_config)
+        for setting_name, setting_config in notetype_setting_definitions.setting_configs.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def _notetype_version_res(notetype_name: str) -> Tuple[re.Pattern, re.Pattern]:
+    escaped_name = re.escape(notetype_name)
+    return (
+        re.compile(ANKIHUB_NOTETYPE_RE.format(notetype_name=escaped_name)),
+        re.compile(NOTETYPE_COPY_RE.format(notetype_name=escaped_name)),
+    )
 
 
 class NotetypesConfigWindow:
 
     window: Optional[ConfigWindow] = None
 
+    _VERSION_RE = re.compile(r"<!-- version ([\w\d]+) -->\n")
+
     def __init__(self, clayout_: CardLayout = None):
 
+        # anking_notetype_names reads the notetype files, so the names are only read once
+        self.notetype_names: Tuple[str, ...] = tuple(anking_notetype_names())
+        # cached result of models_with_available_updates, reset when notetypes get changed
+        self._models_with_updates: Optional[List["NotetypeDict"]] = None
+
         # code in this class assumes that if bool(clayout) is true, clayout.model contains
         # an anking notetype model
         self.clayout = None
         if clayout_:
-            if clayout_.model["name"] in anking_notetype_names():
+            name = clayout_.model["name"]
+            if name in self.notetype_names:
                 self.clayout = clayout_
             elif (
-                clayout_.model["name"] in self._all_supported_note_types()
-                and (base_name := self._base_name(clayout_.model["name"])) is not None
-            ):
+                base_name := self._base_name(name)
+            ) is not None and self._is_notetype_version(name, base_name):
                 showInfo(
                     "When you edit this note type here you won't see the changes in the preview.\n\n"
                     f'You can edit "{base_name}" instead and the changes '
                     "will be applied to this note type too."
                 )
 
-        self.conf = None
-        self.last_general_ntss: Union[List[NotetypeSetting], None] = None
+        self.conf: Optional[ConfigManager] = None
+        self.tabs_to_populate: Dict[str, ConfigLayout] = dict()
+        # indices of the tabs of the config window, kept up to date by _add_tab and _remove_tab
+        self.tab_idx_by_name: Dict[str, int] = dict()
+        # values of the settings of each notetype, see _read_in_settings_from_notetypes
+        self.setting_values_by_notetype: Dict[str, Dict[NotetypeSetting, Any]] = dict()
 
     def open(self):
 
@@ -102,33 +144,28 @@ class NotetypesConfigWindow:
 
         self._read_in_settings()
 
+        # apply changes of general settings to all notetypes
+        self.general_key_to_notetype_keys = {
+            f"general.{setting_name}": [
+                f"{notetype_name}.{setting_name}"
+                for notetype_name in self.notetype_names
+            ]
+            for setting_name in general_settings
+        }
+        self.conf.on_change(self._apply_general_setting_change)
+
         # add general tab
-        self.conf.add_config_tab(lambda window: self._add_general_tab(window))
+        self.conf.add_config_tab(self._add_general_tab)
 
         # setup tabs for all notetypes
-        for notetype_name in sorted(anking_notetype_names()):
+        for notetype_name in sorted(self.notetype_names):
             self.conf.add_config_tab(
-                lambda window, notetype_name=notetype_name: self._add_notetype_settings_tab(
-                    notetype_name, window
-                )
+                partial(self._add_notetype_settings_tab, notetype_name)
             )
 
         # setup live update of clayout model on changes
-        def live_update_clayout_model(key: str, _: Any):
-            model = self.clayout.model
-            notetype_name, setting_name = key.split(".")
-            if notetype_name != self.clayout.model["name"]:
-                return
-
-            nts = NotetypeSetting.from_config(setting_configs[setting_name])
-            self._safe_update_model_settings(
-                model=model, model_base_name=model["name"], ntss=[nts]
-            )
-
-            self._update_clayout_model(model)
-
         if self.clayout:
-            self.conf.on_change(live_update_clayout_model)
+            self.conf.on_change(self._live_update_clayout_model)
 
         # change window settings, overwrite on_save, setup notetype updates
         self.conf.on_window_open(self._setup_window_settings)
@@ -146,12 +183,10 @@ class NotetypesConfigWindow:
         window.setMinimumWidth(500)
 
         # overwrite on_save function
-        def on_save(window: ConfigWindow):
-            self._apply_setting_changes_for_all_notetypes()
-            window.close()
-
         window.save_btn.clicked.disconnect()  # type: ignore
-        window.save_btn.clicked.connect(lambda: on_save(window))  # type: ignore
+        window.save_btn.clicked.connect(self._on_save)  # type: ignore
+
+        window.main_tab.currentChanged.connect(self._on_current_tab_changed)  # type: ignore
 
         if self.clayout:
             self._set_active_tab(self.clayout.model["name"])
@@ -172,19 +207,59 @@ class NotetypesConfigWindow:
             widget, href="https://github.com/AnKingMed/AnKing-Note-Types/issues"
         )
 
+    def _on_save(self) -> None:
+        # the settings are applied in the background to keep the window responsive,
+        # the changed notetypes are written to the collection on the main thread
+        def on_done(changed_models_fut: Future):
+            try:
+                changed_models = changed_models_fut.result()
+            # any error of the task has to keep the window open, not only parsing errors
+            except Exception as e:  # pylint: disable=broad-except
+                # nothing was saved, the window stays open so that the changes aren't lost
+                showInfo(f"Failed saving the note type settings:\n{str(e)}")
+                return
+
+            for model in changed_models:
+                mw.col.models.update_dict(model)  # type: ignore
+            self.window.close()
+
+        mw.taskman.with_progress(
+            parent=self.window,
+            label="Saving note type settings...",
+            task=self._apply_setting_changes_for_all_notetypes,
+            on_done=on_done,
+            immediate=True,
+        )
+
     # tabs and NotetypeSettings (ntss)
     def _add_notetype_settings_tab(
         self,
         notetype_name: str,
         window: ConfigWindow,
+    ):
+        # the widgets of the tab are only added when the tab is shown for the first time
+        # (see _populate_tab_if_needed) to make opening the window faster
+        tab = self._add_tab(notetype_name, window)
+        self.tabs_to_populate[notetype_name] = tab
+
+    def _populate_tab_if_needed(self, tab_name: str) -> None:
+        tab = self.tabs_to_populate.pop(tab_name, None)
+        if tab is None:
+            return
+
+        self._populate_notetype_settings_tab(tab_name, tab)
+        self.window.update_widgets()
+
+    def _populate_notetype_settings_tab(
+        self,
+        notetype_name: str,
+        tab: ConfigLayout,
     ):
         if self.clayout and self.clayout.model["name"] == notetype_name:
             model = self.clayout.model
         else:
             model = mw.col.models.by_name(notetype_name)  # type: ignore
 
-        tab = window.add_tab(notetype_name)
-
         if model:
             ntss = ntss_for_model(model)
             ordered_ntss = self._adjust_configurable_field_nts_order(
@@ -197,7 +272,7 @@ class NotetypesConfigWindow:
             layout = tab.hlayout()
             layout.button(
                 "Reset",
-                on_click=lambda: self._reset_notetype_and_reload_ui(model),
+                on_click=partial(self._reset_notetype_and_reload_ui, model),
             )
             layout.stretch()
         else:
@@ -206,26 +281,16 @@ class NotetypesConfigWindow:
 
             tab.button(
                 "Import",
-                on_click=lambda: self._import_notetype_and_reload_tab(notetype_name),
+                on_click=partial(self._import_notetype_and_reload_tab, notetype_name),
             )
 
     def _add_general_tab(self, window: ConfigWindow):
-        tab = window.add_tab("General")
-
-        prev_ntss = self.last_general_ntss
-        self.last_general_ntss = ntss = general_ntss()
+        tab = self._add_tab("General", window)
 
         scroll = tab.scroll_layout()
-        self._add_nts_widgets_to_layout(scroll, ntss, None, general=True)
+        self._add_nts_widgets_to_layout(scroll, general_ntss(), None, general=True)
         scroll.stretch()
 
-        if prev_ntss:
-            for nts in prev_ntss:
-                nts.unregister_general_setting(tab.conf)
-
-        for nts in ntss:
-            nts.register_general_setting(tab.conf)
-
         tab.space(10)
         tab.text(
             "Changes made here will be applied to all note types that have this setting",
@@ -239,11 +304,23 @@ class NotetypesConfigWindow:
             on_click=self._update_all_notetypes_to_newest_version_and_reload_ui,
         )
 
-        if self.models_with_available_updates():
+        if self._models_with_available_updates_cached():
             tab.text("New versions of notetypes are available!")
         else:
             update_btn.setDisabled(True)
 
+    def _apply_general_setting_change(self, key: str, value: Any) -> None:
+        notetype_keys = self.general_key_to_notetype_keys.get(key)
+        if notetype_keys is None:
+            return
+
+        # sets the config value for all anking notetypes
+        # even if they dont have this setting available
+        # (in this case it will be ignored)
+        for notetype_key in notetype_keys:
+            self.conf.set(notetype_key, value)
+        self.window.update_widgets()
+
     def _add_nts_widgets_to_layout(
         self,
         layout: ConfigLayout,
@@ -255,15 +332,13 @@ class NotetypesConfigWindow:
         if general:
             assert model is None
 
-        nts_to_section = {
-            nts: section_name
-            for nts in ntss
-            if (section_name := nts.config.get("section", None))
-        }
-
-        section_to_ntss: Dict[str, List[NotetypeSetting]] = defaultdict(lambda: [])
-        for nts, section in nts_to_section.items():
-            section_to_ntss[section].append(nts)
+        section_to_ntss: Dict[str, List[NotetypeSetting]] = defaultdict(list)
+        other_ntss: List[NotetypeSetting] = []
+        for nts in ntss:
+            if section_name := nts.config.get("section", None):
+                section_to_ntss[section_name].append(nts)
+            else:
+                other_ntss.append(nts)
 
         for section_name, section_ntss in sorted(section_to_ntss.items()):
             section = layout.collapsible_section(section_name)
@@ -276,9 +351,6 @@ class NotetypesConfigWindow:
             layout.hseparator()
             layout.space(10)
 
-        other_ntss: List[NotetypeSetting] = [
-            nts for nts in ntss if nts not in nts_to_section.keys()
-        ]
         for nts in other_ntss:
             if general:
                 nts.add_widget_to_general_config_layout(layout)
@@ -294,57 +366,92 @@ class NotetypesConfigWindow:
         # it would probably be better to check the order of the buttons on the current
         # version of the card, not the original one
 
-        field_ntss = [
-            nts for nts in ntss if nts.config.get("configurable_field_name", False)
-        ]
-        ordered_field_names = configurable_fields_for_notetype(notetype_name)
+        field_ntss: List[NotetypeSetting] = []
+        other_ntss: List[NotetypeSetting] = []
+        for nts in ntss:
+            if nts.config.get("configurable_field_name", False):
+                field_ntss.append(nts)
+            else:
+                other_ntss.append(nts)
+
+        field_name_to_idx = {
+            name: idx
+            for idx, name in enumerate(configurable_fields_for_notetype(notetype_name))
+        }
         ordered_field_ntss = sorted(
             field_ntss,
-            key=lambda nts: (
-                ordered_field_names.index(name)
-                if (name := nts.config["configurable_field_name"])
-                in ordered_field_names
-                else -1  # can happen because of different quotes in template versions
+            key=lambda nts: field_name_to_idx.get(
+                nts.config["configurable_field_name"],
+                -1,  # can happen because of different quotes in template versions
             ),
         )
 
-        other_ntss = [nts for nts in ntss if nts not in field_ntss]
         return other_ntss + ordered_field_ntss
 
     # tab actions
     def _set_active_tab(self, tab_name: str) -> None:
         tab_widget = self.window.main_tab
         tab_widget.setCurrentIndex(self._get_tab_idx_by_name(tab_name))
+        # currentChanged is not emitted if the index stays the same
+        self._populate_tab_if_needed(tab_name)
+
+    def _on_current_tab_changed(self, index: int) -> None:
+        self._populate_tab_if_needed(self.window.main_tab.tabText(index))
 
     def _reload_tab(self, tab_name: str) -> None:
+        self._reload_tabs([tab_name], active_tab_name=tab_name)
+
+    def _reload_tabs(self, tab_names: List[str], active_tab_name: str) -> None:
+        # the tab widget is not redrawn and doesn't emit signals while the tabs are replaced,
+        # the active tab gets populated by _set_active_tab at the end
         tab_widget = self.window.main_tab
-        index = self._get_tab_idx_by_name(tab_name)
-        tab_widget.removeTab(index)
+        tab_widget.setUpdatesEnabled(False)
+        tab_widget.blockSignals(True)
+        try:
+            notetype_names = []
+            for tab_name in tab_names:
+                if tab_name == "General":
+                    self._remove_tab(tab_name)
+                    self._add_general_tab(self.window)
+                    continue
 
-        if tab_name == "General":
-            self._add_general_tab(self.window)
-        else:
-            notetype_name = tab_name
-            self._add_notetype_settings_tab(notetype_name, self.window)
-            # inserting the tab at its index or moving it to it after adding doesn't work for
-            # some reason
-            # tab_widget.tabBar().move(tab_widget.tabBar().count()-1, index)
+                notetype_names.append(tab_name)
+                if tab_name in self.tabs_to_populate:
+                    # the tab wasn't shown yet and will be populated with the current
+                    # version of the notetype when it is shown
+                    continue
 
-            self._read_in_settings()
+                self._remove_tab(tab_name)
+                notetype_name = tab_name
+                self._add_notetype_settings_tab(notetype_name, self.window)
+                # inserting the tab at its index or moving it to it after adding doesn't work for
+                # some reason
+                # tab_widget.tabBar().move(tab_widget.tabBar().count()-1, index)
 
-        self.window.update_widgets()
-        self._set_active_tab(tab_name)
+            if notetype_names:
+                self._read_in_settings_for(notetype_names)
 
-    def _get_tab_idx_by_name(self, tab_name: str) -> int:
-        tab_widget = self.window.main_tab
-        return next(
-            (
-                index
-                for index in range(tab_widget.count())
-                if tab_name == tab_widget.tabText(index)
-            ),
-            None,
-        )
+            self.window.update_widgets()
+        finally:
+            tab_widget.blockSignals(False)
+            tab_widget.setUpdatesEnabled(True)
+
+        self._set_active_tab(active_tab_name)
+
+    def _get_tab_idx_by_name(self, tab_name: str) -> Optional[int]:
+        return self.tab_idx_by_name.get(tab_name)
+
+    def _add_tab(self, tab_name: str, window: ConfigWindow) -> ConfigLayout:
+        tab = window.add_tab(tab_name)
+        self.tab_idx_by_name[tab_name] = window.main_tab.count() - 1
+        return tab
+
+    def _remove_tab(self, tab_name: str) -> None:
+        index = self.tab_idx_by_name.pop(tab_name)
+        self.window.main_tab.removeTab(index)
+        for name, idx in self.tab_idx_by_name.items():
+            if idx > index:
+                self.tab_idx_by_name[name] = idx - 1
 
     # reset / update / import notetypes
     # note: these actions can be called by clicking their buttons and will modify mw.col.models regardless
@@ -361,6 +468,7 @@ class NotetypesConfigWindow:
         for model_version in self._notetype_versions(model["name"]):
             update_notetype_to_newest_version(model_version, model["name"])
             mw.col.models.update_dict(model_version)  # type: ignore
+        self._models_with_updates = None
 
         if self.clayout:
             self._update_clayout_model(model)
@@ -380,10 +488,15 @@ class NotetypesConfigWindow:
 
         def task():
 
+            # the models are fetched again so that no outdated model dicts are written back
             to_be_updated = self.models_with_available_updates()
+            self._models_with_updates = None
 
+            names_and_ids = mw.col.models.all_names_and_ids()
             for model in to_be_updated:
-                for model_version in self._notetype_versions(model["name"]):
+                for model_version in self._notetype_versions(
+                    model["name"], names_and_ids
+                ):
                     update_notetype_to_newest_version(model_version, model["name"])
 
                     # restore the values from before the update for the settings that exist in both versions
@@ -411,11 +524,10 @@ class NotetypesConfigWindow:
                 if self.clayout and model["name"] == self.clayout.model["name"]:
                     self._update_clayout_model(model)
 
-            self._reload_tab("General")
-            for model in sorted(updated, key=lambda m: m["name"]):
-                self._reload_tab(model["name"])
-
-            self._set_active_tab("General")
+            self._reload_tabs(
+                ["General"] + sorted(model["name"] for model in updated),
+                active_tab_name="General",
+            )
 
             tooltip("Note types were updated", parent=self.window, period=1200)
 
@@ -436,7 +548,7 @@ class NotetypesConfigWindow:
     @classmethod
     def model_version(cls, model):
         front = model["tmpls"][0]["qfmt"]
-        m = re.match(r"<!-- version ([\w\d]+) -->\n", front)
+        m = cls._VERSION_RE.match(front)
         if not m:
             return None
         return m.group(1)
@@ -450,6 +562,11 @@ class NotetypesConfigWindow:
             and cls._new_notetype_version_available(model)
         ]
 
+    def _models_with_available_updates_cached(self) -> List["NotetypeDict"]:
+        if self._models_with_updates is None:
+            self._models_with_updates = self.models_with_available_updates()
+        return self._models_with_updates
+
     def _import_notetype_and_reload_tab(self, notetype_name: str) -> None:
         self._import_notetype(notetype_name)
         self._reload_tab(notetype_name)
@@ -458,6 +575,7 @@ class NotetypesConfigWindow:
         model = anking_notetype_model(notetype_name)
         model["id"] = 0
         mw.col.models.add_dict(model)  # type: ignore
+        self._models_with_updates = None
 
     # read / write notetype settings
     # changes to settings will be written to mw.col.models when the Save button is pressed
@@ -466,12 +584,25 @@ class NotetypesConfigWindow:
     def _read_in_settings(self):
 
         # read in settings from notetypes and general ones into config
-        self._read_in_settings_from_notetypes()
+        # (the notetypes are only looked up and parsed once for both)
+        self._read_in_settings_for(self.notetype_names)
+
+    def _read_in_settings_for(self, notetype_names: Sequence[str]):
+        # like _read_in_settings, but only reads the settings of the passed notetypes
+        # (the values of the other notetypes are still needed for the general settings and
+        # are taken from self.setting_values_by_notetype)
+        self._read_in_settings_from_notetypes(notetype_names)
         self._read_in_general_settings()
 
-    def _read_in_settings_from_notetypes(self):
+    def _read_in_settings_from_notetypes(self, notetype_names: Sequence[str]):
+        # the values of each nts on the notetypes are stored in self.setting_values_by_notetype
+        # (values that couldn't be parsed are represented by the exception raised for them)
+
+        # bound once because it is called for every setting of every notetype
+        conf_set = self.conf.set
         error_msg = ""
-        for notetype_name in anking_notetype_names():
+        for notetype_name in notetype_names:
+            self.setting_values_by_notetype.pop(notetype_name, None)
 
             if self.clayout and notetype_name == self.clayout.model["name"]:
                 # if in live preview mode read in current not confirmed settings
@@ -481,11 +612,21 @@ class NotetypesConfigWindow:
 
             if not model:
                 continue
+
+            values: Dict[NotetypeSetting, Any] = dict()
             for nts in ntss_for_model(model):
                 try:
-                    self.conf[nts.key(notetype_name)] = nts.setting_value(model)
+                    value = nts.setting_value(model)
                 except NotetypeSettingException as e:
                     error_msg += f"failed parsing {notetype_name}:\n{str(e)}\n\n"
+                    values[nts] = e
+                    continue
+
+                values[nts] = value
+                # the values are read from the models, so there is nothing for the
+                # change hooks (e.g. the live update of the clayout model) to do
+                conf_set(nts.key(notetype_name), value, on_change_trigger=False)
+            self.setting_values_by_notetype[notetype_name] = values
 
         if error_msg:
             showInfo(error_msg)
@@ -497,25 +638,19 @@ class NotetypesConfigWindow:
             self.conf.set(f"general.{setting_name}", value, on_change_trigger=False)
 
         # if all notetypes that have a nts have the same value set the value to it
-        models_by_nts: Dict[NotetypeSetting, "NotetypeDict"] = defaultdict(lambda: [])
-        for notetype_name in anking_notetype_names():
-            model = mw.col.models.by_name(notetype_name)
-            if not model:
+        values_by_nts: Dict[NotetypeSetting, List[Any]] = defaultdict(list)
+        for values_of_notetype in self.setting_values_by_notetype.values():
+            for nts, value in values_of_notetype.items():
+                values_by_nts[nts].append(value)
+
+        for nts, values in values_by_nts.items():
+            setting_value = values[0]
+            if isinstance(setting_value, NotetypeSettingException):
                 continue
-
-            ntss = ntss_for_model(model)
-            for nts in ntss:
-                models_by_nts[nts].append(model)
-
-        for nts, models in models_by_nts.items():
-            try:
-                setting_value = nts.setting_value(models[0]) if models else None
-                if all(setting_value == nts.setting_value(model) for model in models):
-                    self.conf.set(
-                        f"general.{nts.name()}", setting_value, on_change_trigger=False
-                    )
-            except NotetypeSettingException:
-                pass
+            if all(value == setting_value for value in values):
+                self.conf.set(
+                    f"general.{nts.name()}", setting_value, on_change_trigger=False
+                )
 
     def _safe_update_model_settings(
         self,
@@ -528,71 +663,98 @@ class NotetypesConfigWindow:
         # the passed settings in the model are set to the values of these settings in self.conf
         # If this function is successful it will return True,
         # if there is an exception while parsing the notetype it will return False (and show a tooltip)
-        parse_exception = None
-        for nts in ntss:
-            try:
-                model.update(
-                    nts.updated_model(
-                        model=model,
-                        model_base_name=model_base_name,
-                        conf=self.conf,
-                    )
-                )
-            except NotetypeSettingException as e:
-                parse_exception = e
+        parse_exceptions = update_model_settings(
+            model=model,
+            model_base_name=model_base_name,
+            ntss=ntss,
+            conf=self.conf,
+        )
 
-        if parse_exception:
+        if parse_exceptions:
+            parse_exception = parse_exceptions[-1]
             message = f"failed parsing {model['name']}:\n{str(parse_exception)}"
             if show_tooltip_on_exception:
-                tooltip(message)
+                # this can be called from a background thread
+                mw.taskman.run_on_main(lambda: tooltip(message))
             print(message)
             return False
 
         return True
 
-    def _apply_setting_changes_for_all_notetypes(self):
-        for notetype_name in anking_notetype_names():
-            for model in self._notetype_versions(notetype_name):
+    def _apply_setting_changes_for_all_notetypes(self) -> List["NotetypeDict"]:
+        # returns copies of the models that were changed
+        # (they are written to the collection by the caller)
+        # this runs in a background thread, so the models are copied before they are changed,
+        # the ones returned by mw.col.models.get are cached and used by the main thread too
+        result = []
+        names_and_ids = mw.col.models.all_names_and_ids()
+        for notetype_name in self.notetype_names:
+            for model in self._notetype_versions(notetype_name, names_and_ids):
                 if not model:
                     continue
+                model = deepcopy(model)
+                texts_before = _template_texts(model)
                 ntss = ntss_for_model(model)
                 self._safe_update_model_settings(
                     model=model, model_base_name=notetype_name, ntss=ntss
                 )
-                mw.col.models.update_dict(model)
+                # only notetypes whose settings changed are written to the collection
+                if _template_texts(model) != texts_before:
+                    result.append(model)
 
-    def _notetype_versions(self, notetype_name: str) -> List["NotetypeDict"]:
+        return result
+
+    def _notetype_versions(
+        self, notetype_name: str, names_and_ids: Optional[Sequence[Any]] = None
+    ) -> List["NotetypeDict"]:
         """
         This is done to make this add-on compatible with note types created by AnkiHub decks.
         Returns a list of all notetype versions of the notetype in the collection.
+        names_and_ids can be passed to avoid fetching mw.col.models.all_names_and_ids()
+        again when this is called for multiple notetypes.
         """
+        if names_and_ids is None:
+            names_and_ids = mw.col.models.all_names_and_ids()
+
         models = [
             mw.col.models.get(x.id)  # type: ignore
-            for x in mw.col.models.all_names_and_ids()
-            if x.name == notetype_name
-            or re.match(ANKIHUB_NOTETYPE_RE.format(notetype_name=notetype_name), x.name)
-            or re.match(NOTETYPE_COPY_RE.format(notetype_name=notetype_name), x.name)
+            for x in names_and_ids
+            if self._is_notetype_version(x.name, notetype_name)
         ]
         return models
 
-    def _all_supported_note_types(self) -> List[str]:
-        return [
-            version["name"]
-            for base_name in anking_notetype_names()
-            for version in self._notetype_versions(base_name)
-        ]
+    def _is_notetype_version(self, name: str, notetype_name: str) -> bool:
+        # whether a notetype with this name is a version of the notetype
+        # (the notetype itself, a copy of it or an AnkiHub version of it)
+        if name == notetype_name:
+            return True
+        ankihub_notetype_re, notetype_copy_re = _notetype_version_res(notetype_name)
+        return bool(ankihub_notetype_re.match(name) or notetype_copy_re.match(name))
 
     def _base_name(self, notetype_name: str) -> str:
         return next(
             (
                 name
-                for name in anking_notetype_names()
+                for name in self.notetype_names
                 if notetype_name.startswith(name + " ")
             ),
             None,
         )
 
     # clayout
+    def _live_update_clayout_model(self, key: str, _: Any) -> None:
+        model = self.clayout.model
+        notetype_name, setting_name = key.split(".")
+        if notetype_name != model["name"]:
+            return
+
+        nts = _all_ntss()[setting_name]
+        self._safe_update_model_settings(
+            model=model, model_base_name=model["name"], ntss=[nts]
+        )
+
+        self._update_clayout_model(model)
+
     def _update_clayout_model(self, model):
         # update templates
         # keep scrollbar in note type manager window where it was
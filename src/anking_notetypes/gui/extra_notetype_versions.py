@@ -15,15 +15,17 @@ def handle_extra_notetype_versions() -> None:
 
     # mids of copies of the AnKing notetype identified by its name
     copy_mids_by_notetype: Dict[str, List[int]] = dict()
+    names_and_ids = mw.col.models.all_names_and_ids()
     for notetype_name in anking_notetype_names():
 
         if mw.col.models.by_name(notetype_name) is None:
             continue
 
+        notetype_copy_re = re.compile(
+            NOTETYPE_COPY_RE.format(notetype_name=re.escape(notetype_name))
+        )
         notetype_copy_mids = [
-            x.id
-            for x in mw.col.models.all_names_and_ids()
-            if re.match(NOTETYPE_COPY_RE.format(notetype_name=notetype_name), x.name)
+            x.id for x in names_and_ids if notetype_copy_re.match(x.name)
         ]
         if notetype_copy_mids:
             copy_mids_by_notetype[notetype_name] = notetype_copy_mids
@@ -1,24 +1,52 @@
 import re
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from typing import Any, Callable, Dict, OrderedDict, Union
+from collections import defaultdict
+from typing import Any, Dict, List, OrderedDict, Set, Tuple, Union
 
 from .ankiaddonconfig import ConfigLayout, ConfigManager
-from .notetype_setting_definitions import anking_notetype_names
 
 try:
     from anki.models import NotetypeDict  # pylint: disable=unused-import
 except:
     pass
 
+# the regex parser is only used to find a literal for the quick check in _required_literal,
+# if it isn't available (it isn't public) the quick check is skipped
+try:
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse  # type: ignore # pylint: disable=deprecated-module
+    except ImportError:
+        sre_parse = None
+
+
+# shared NotetypeSetting instances by setting name, see NotetypeSetting.from_config
+_nts_by_name: Dict[str, "NotetypeSetting"] = dict()
+
 
 class NotetypeSetting(ABC):
     def __init__(self, config: Dict):
         self.config = config
-        self.register_general_setting_hook: Union[Callable, None] = None
+        self._pattern = re.compile(config["regex"])
+        # text that every match of the pattern contains, used to skip the regex search
+        # when the setting is obviously not present in the template
+        self._quick_check = _required_literal(self._pattern)
 
     @staticmethod
     def from_config(config: Dict) -> "NotetypeSetting":
+        # instances don't hold notetype specific state (the model is passed to the methods),
+        # so one instance per setting is shared instead of compiling its patterns again
+        name = config.get("name")
+        nts = _nts_by_name.get(name) if name is not None else None
+        if nts is None or nts.config is not config:
+            nts = NotetypeSetting._from_config(config)
+            if name is not None:
+                _nts_by_name[name] = nts
+        return nts
+
+    @staticmethod
+    def _from_config(config: Dict) -> "NotetypeSetting":
         if config["type"] == "checkbox":
             return CheckboxSetting(config)
         if config["type"] == "re_checkbox":
@@ -54,49 +82,52 @@ class NotetypeSetting(ABC):
         model = {"name": "general"}
         self.add_widget_to_config_layout(layout, model)
 
-    def register_general_setting(self, conf: ConfigManager):
-        def update_all(key, value):
-            if self.key("general") != key:
-                return
-
-            # sets the config value for all anking notetypes
-            # even if they dont have this setting available
-            # (in this case it will be ignored)
-            for notetype_name in anking_notetype_names():
-                conf.set(self.key(notetype_name), value)
-            conf.config_window.update_widgets()
-
-        self.register_general_setting_hook = update_all
-        conf.on_change(update_all)
-
-    def unregister_general_setting(self, conf: ConfigManager):
-        assert (
-            self.register_general_setting_hook is not None
-        ), "tried unregistering general setting without registering it first"
-        conf.remove_on_change_hook(self.register_general_setting_hook)
-
     def is_present(self, model: "NotetypeDict") -> bool:
         # returns True if the section related to the setting is present on the model
-        relevant_template_text = self._relevant_template_text(model)
-        return bool(re.search(self.config["regex"], relevant_template_text))
+        relevant_template_text = self.relevant_template_text(model)
+        return bool(self._search(relevant_template_text))
 
     # can raise NotetypeSettingException
     def setting_value(self, model: "NotetypeDict") -> Any:
         try:
-            section = self._relevant_template_section(model)
-            result = self._extract_setting_value(section)
+            section_match = self._relevant_template_section_match(model)
+            result = self._extract_setting_value_from_match(section_match)
         except NotetypeSettingException as e:
             raise e
         except Exception as e:
             raise NotetypeSettingException(e)
         return result
 
+    # updates the model in place and returns it, copy the model before passing it
+    # if the original should be kept
     # can raise NotetypeSettingException
     def updated_model(
         self, model: "NotetypeDict", model_base_name: str, conf: ConfigManager
     ) -> "NotetypeDict":
-        result = deepcopy(model)
-        section = self._relevant_template_section(result)
+        edit = self.template_edit(model, model_base_name, conf)
+        if edit is None:
+            return model
+
+        start, end, replacement = edit
+        text = self.relevant_template_text(model)
+        self.set_relevant_template_text(model, text[:start] + replacement + text[end:])
+        return model
+
+    def name(self):
+        return self.config["name"]
+
+    def key(self, notetype_name: str) -> str:
+        # returns the config key of this setting for the notetype in the config
+        return f"{notetype_name}.{self.name()}"
+
+    # can raise NotetypeSettingException
+    def template_edit(
+        self, model: "NotetypeDict", model_base_name: str, conf: ConfigManager
+    ) -> Union[Tuple[int, int, str], None]:
+        # returns (start, end, replacement) so that replacing text[start:end] of the relevant
+        # template text with replacement sets the setting to its value in the config
+        # returns None if there is nothing to change
+        section_match = self._relevant_template_section_match(model)
         key = self.key(model_base_name)
 
         # if the setting is not in the config,
@@ -104,49 +135,66 @@ class NotetypeSetting(ABC):
         no_value = object()  # value different from all other values
         setting_value = conf.get(key, self.config.get("default", no_value))
         if setting_value is no_value:
-            return result
+            return None
 
         try:
-            processed_section = self._set_setting_value(section, setting_value)
-
-            updated_text = self._relevant_template_text(result).replace(
-                section, processed_section, 1
+            start, end, replacement = self._set_setting_value_from_match(
+                section_match, setting_value
             )
         except NotetypeSettingException as e:
             raise e
         except Exception as e:
             raise NotetypeSettingException(e)
 
-        templates = result["tmpls"]
+        if replacement == section_match.string[start:end]:
+            return None
+
+        return (start, end, replacement)
+
+    def relevant_template_text(self, model: "NotetypeDict") -> str:
+        templates = model["tmpls"]
+
+        # all the AnKing notetypes have one template each
         assert len(templates) == 1
         template = templates[0]
 
         if self.config["file"] == "front":
-            template["qfmt"] = updated_text
+            result = template["qfmt"]
         elif self.config["file"] == "back":
-            template["afmt"] = updated_text
+            result = template["afmt"]
         else:
-            result["css"] = updated_text
-
+            result = model["css"]
         return result
 
-    def name(self):
-        return self.config["name"]
+    def set_relevant_template_text(self, model: "NotetypeDict", text: str) -> None:
+        templates = model["tmpls"]
+        assert len(templates) == 1
+        template = templates[0]
 
-    def key(self, notetype_name: str) -> str:
-        # returns the config key of this setting for the notetype in the config
-        return f"{notetype_name}.{self.name()}"
+        if self.config["file"] == "front":
+            template["qfmt"] = text
+        elif self.config["file"] == "back":
+            template["afmt"] = text
+        else:
+            model["css"] = text
 
     def _relevant_template_section(self, model: "NotetypeDict"):
-        template_text = self._relevant_template_text(model)
-        section_match = re.search(self.config["regex"], template_text)
+        return self._relevant_template_section_match(model).group(0)
+
+    def _relevant_template_section_match(self, model: "NotetypeDict") -> re.Match:
+        template_text = self.relevant_template_text(model)
+        section_match = self._search(template_text)
         if not section_match:
             raise NotetypeSettingException(
                 f"could not find '{self.config['text']}' in {self.config['file']}"
                 "template of notetype '{model['name']}'"
             )
-        result = section_match.group(0)
-        return result
+        return section_match
+
+    def _search(self, text: str) -> Union[re.Match, None]:
+        if self._quick_check not in text:
+            return None
+        return self._pattern.search(text)
 
     # raises NotetypeSettingException if the current setting value is
     # not of the expected form and has to be changed for the notetype to work
@@ -159,33 +207,194 @@ class NotetypeSetting(ABC):
     def _set_setting_value(self, section: str, setting_value: Any):
         pass
 
-    def _relevant_template_text(self, model: "NotetypeDict") -> str:
-        templates = model["tmpls"]
+    # like _extract_setting_value, but gets passed the match of the setting regex on the
+    # template text, subclasses can override this to avoid searching the section again
+    def _extract_setting_value_from_match(self, section_match: re.Match) -> Any:
+        return self._extract_setting_value(section_match.group(0))
+
+    # returns (start, end, replacement) so that replacing section_match.string[start:end]
+    # with replacement sets the setting to setting_value
+    # subclasses can override this to avoid searching the section again
+    def _set_setting_value_from_match(
+        self, section_match: re.Match, setting_value: Any
+    ) -> Tuple[int, int, str]:
+        start, end = section_match.span()
+        return (
+            start,
+            end,
+            self._set_setting_value(section_match.group(0), setting_value),
+        )
 
-        # all the AnKing notetypes have one template each
-        assert len(templates) == 1
-        template = templates[0]
 
-        if self.config["file"] == "front":
-            result = template["qfmt"]
-        elif self.config["file"] == "back":
-            result = template["afmt"]
-        else:
-            result = model["css"]
-        return result
+class NotetypeSettingException(Exception):
+    pass
 
-    def _replace_first_capture_group(self, section: str, new_value_str: Any) -> str:
-        m = re.search(self.config["regex"], section)
-        start, end = m.span(1)
-        result = section[:start] + new_value_str + section[end:]
-        return result
 
+class CaptureGroupSetting(NotetypeSetting):
+    # base class for settings whose value is the first capture group of the setting regex
+    # subclasses implement _value_from_str and _value_to_str
 
-class NotetypeSettingException(Exception):
-    pass
+    # raises NotetypeSettingException if the value string is not of the expected form
+    @abstractmethod
+    def _value_from_str(self, value_str: str) -> Any:
+        pass
+
+    @abstractmethod
+    def _value_to_str(self, setting_value: Any) -> str:
+        pass
+
+    def _extract_setting_value(self, section: str) -> Any:
+        return self._extract_setting_value_from_match(self._pattern.search(section))
+
+    def _set_setting_value(self, section: str, setting_value: Any) -> str:
+        start, end, replacement = self._set_setting_value_from_match(
+            self._pattern.search(section), setting_value
+        )
+        return section[:start] + replacement + section[end:]
+
+    def _extract_setting_value_from_match(self, section_match: re.Match) -> Any:
+        return self._value_from_str(section_match.group(1))
+
+    def _set_setting_value_from_match(
+        self, section_match: re.Match, setting_value: Any
+    ) -> Tuple[int, int, str]:
+        start, end = section_match.span(1)
+        return (start, end, self._value_to_str(setting_value))
+
+
+# updates the model in place so that the settings of the passed ntss are set to their values
+# in the config
+# the changes of the settings that belong to the same template text are collected first and
+# then applied to the text in one go, the result is the same as applying the settings one
+# after another
+# returns the exceptions that occured while parsing the settings, the settings that caused
+# them are left unchanged
+def update_model_settings(
+    model: "NotetypeDict",
+    model_base_name: str,
+    ntss: List[NotetypeSetting],
+    conf: ConfigManager,
+) -> List[NotetypeSettingException]:
+    exceptions: List[NotetypeSettingException] = []
+
+    ntss_by_file: Dict[str, List[NotetypeSetting]] = defaultdict(list)
+    for nts in ntss:
+        ntss_by_file[nts.config["file"]].append(nts)
+
+    for file_ntss in ntss_by_file.values():
+        # an ElementOrderSetting replaces its whole section (e.g. the whole back template),
+        # so its edit would overlap with the edits of all other settings
+        # these are applied on their own and the settings between them are batched
+        batch: List[NotetypeSetting] = []
+        for nts in file_ntss:
+            if isinstance(nts, ElementOrderSetting):
+                _update_model_settings_batch(
+                    model, model_base_name, batch, conf, exceptions
+                )
+                batch = []
+                _update_model_setting(model, model_base_name, nts, conf, exceptions)
+            else:
+                batch.append(nts)
+        _update_model_settings_batch(model, model_base_name, batch, conf, exceptions)
+
+    return exceptions
+
+
+def _update_model_setting(
+    model: "NotetypeDict",
+    model_base_name: str,
+    nts: NotetypeSetting,
+    conf: ConfigManager,
+    exceptions: List[NotetypeSettingException],
+) -> None:
+    try:
+        nts.updated_model(model, model_base_name, conf)
+    except NotetypeSettingException as e:
+        exceptions.append(e)
+
+
+def _update_model_settings_batch(
+    model: "NotetypeDict",
+    model_base_name: str,
+    ntss: List[NotetypeSetting],
+    conf: ConfigManager,
+    exceptions: List[NotetypeSettingException],
+) -> None:
+    # the edits of all ntss (which belong to the same template text) are computed on the
+    # same text and spliced into it with one join
+    # edits that overlap with other edits can't be combined this way, the settings they
+    # belong to are applied one after another afterwards
+    # (start, end, replacement, index of nts)
+    edits: List[Tuple[int, int, str, int]] = []
+    for i, nts in enumerate(ntss):
+        try:
+            span = nts.template_edit(model, model_base_name, conf)
+        except NotetypeSettingException as e:
+            exceptions.append(e)
+            continue
+        if span is not None:
+            edits.append((*span, i))
+
+    if not edits:
+        return
+
+    edits.sort(key=lambda edit: edit[0])
+    overlapping: Set[int] = set()
+    group: List[Tuple[int, int, str, int]] = [edits[0]]
+    group_end = edits[0][1]
+    for edit in edits[1:]:
+        start, end, _, _ = edit
+        if start < group_end or start == group[-1][0]:
+            group.append(edit)
+            group_end = max(group_end, end)
+            continue
+        if len(group) > 1:
+            overlapping.update(i for _, _, _, i in group)
+        group = [edit]
+        group_end = end
+    if len(group) > 1:
+        overlapping.update(i for _, _, _, i in group)
+
+    text = ntss[0].relevant_template_text(model)
+    parts = []
+    pos = 0
+    for start, end, replacement, i in edits:
+        if i in overlapping:
+            continue
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    ntss[0].set_relevant_template_text(model, "".join(parts))
+
+    for i in sorted(overlapping):
+        _update_model_setting(model, model_base_name, ntss[i], conf, exceptions)
+
+
+def _required_literal(pattern: re.Pattern) -> str:
+    # returns the longest run of literal characters on the top level of the pattern
+    # (every match contains it) or an empty string if there is none
+    if sre_parse is None or pattern.flags & re.IGNORECASE:
+        return ""
+
+    result = ""
+    cur = ""
+    # LITERAL is defined in the parser module at runtime, pylint can't see it
+    for op, arg in sre_parse.parse(pattern.pattern, pattern.flags):
+        if op == sre_parse.LITERAL:  # pylint: disable=no-member
+            cur += chr(arg)
+            if len(cur) >= len(result):
+                result = cur
+        else:
+            cur = ""
+    return result
 
 
 class ReCheckboxSetting(NotetypeSetting):
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self._replacement_pairs = [(x, y) for x, y in config["replacement_pairs"]]
+
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.checkbox(
             key=self.key(model["name"]),
@@ -194,9 +403,15 @@ class ReCheckboxSetting(NotetypeSetting):
         )
 
     def _extract_setting_value(self, section: str) -> Any:
-        replacement_pairs = self.config["replacement_pairs"]
-        checked = all(y in section for _, y in replacement_pairs)
-        unchecked = all(x in section for x, _ in replacement_pairs)
+        replacement_pairs = self._replacement_pairs
+        checked = unchecked = True
+        for x, y in replacement_pairs:
+            if checked and y not in section:
+                checked = False
+            if unchecked and x not in section:
+                unchecked = False
+            if not checked and not unchecked:
+                break
         if not ((checked or unchecked) and not (checked and unchecked)):
             raise NotetypeSettingException(
                 f"{self.config['text']}: error involving {replacement_pairs=} and {section=}"
@@ -205,8 +420,7 @@ class ReCheckboxSetting(NotetypeSetting):
 
     def _set_setting_value(self, section: str, setting_value: Any) -> str:
         result = section
-        replacement_pairs = self.config["replacement_pairs"]
-        for x, y in replacement_pairs:
+        for x, y in self._replacement_pairs:
             if setting_value:
                 result = result.replace(x, y)
             else:
@@ -240,7 +454,7 @@ class WrapCheckboxSetting(NotetypeSetting):
         return result
 
 
-class CheckboxSetting(NotetypeSetting):
+class CheckboxSetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.checkbox(
             key=self.key(model["name"]),
@@ -248,20 +462,18 @@ class CheckboxSetting(NotetypeSetting):
             tooltip=self.config.get("tooltip", None),
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
-        value = re.search(self.config["regex"], section).group(1)
-        if value not in ["true", "false"]:
+    def _value_from_str(self, value_str: str) -> Any:
+        if value_str not in ["true", "false"]:
             raise NotetypeSettingException(
-                f"{self.config['text']}: expected 'true' or 'false' but got '{value}'"
+                f"{self.config['text']}: expected 'true' or 'false' but got '{value_str}'"
             )
-        return value == "true"
+        return value_str == "true"
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
-        new_value_str = "true" if setting_value else "false"
-        return self._replace_first_capture_group(section, new_value_str)
+    def _value_to_str(self, setting_value: Any) -> str:
+        return "true" if setting_value else "false"
 
 
-class LineEditSetting(NotetypeSetting):
+class LineEditSetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.text_input(
             key=self.key(model["name"]),
@@ -269,15 +481,14 @@ class LineEditSetting(NotetypeSetting):
             tooltip=self.config.get("tooltip", None),
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
-        return re.search(self.config["regex"], section).group(1)
+    def _value_from_str(self, value_str: str) -> Any:
+        return value_str
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
-        new_value_str = setting_value.replace('"', '\\"')
-        return self._replace_first_capture_group(section, new_value_str)
+    def _value_to_str(self, setting_value: Any) -> str:
+        return setting_value.replace('"', '\\"')
 
 
-class FontFamilySetting(NotetypeSetting):
+class FontFamilySetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.font_family_combobox(
             key=self.key(model["name"]),
@@ -285,15 +496,15 @@ class FontFamilySetting(NotetypeSetting):
             tooltip=self.config.get("tooltip", None),
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
+    def _value_from_str(self, value_str: str) -> Any:
         # dont need to verify, because used in css and will be ignored if not valid
-        return re.search(self.config["regex"], section).group(1)
+        return value_str
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
-        return self._replace_first_capture_group(section, setting_value)
+    def _value_to_str(self, setting_value: Any) -> str:
+        return setting_value
 
 
-class DropdownSetting(NotetypeSetting):
+class DropdownSetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.dropdown(
             key=self.key(model["name"]),
@@ -303,19 +514,18 @@ class DropdownSetting(NotetypeSetting):
             values=self.config["options"],
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
-        result = re.search(self.config["regex"], section).group(1)
-        if result not in self.config["options"]:
+    def _value_from_str(self, value_str: str) -> Any:
+        if value_str not in self.config["options"]:
             raise NotetypeSettingException(
-                f"{self.config['text']}: expected one of {self.config['options']} but got {result}"
+                f"{self.config['text']}: expected one of {self.config['options']} but got {value_str}"
             )
-        return result
+        return value_str
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
-        return self._replace_first_capture_group(section, setting_value)
+    def _value_to_str(self, setting_value: Any) -> str:
+        return setting_value
 
 
-class ColorSetting(NotetypeSetting):
+class ColorSetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.color_input(
             key=self.key(model["name"]),
@@ -323,23 +533,20 @@ class ColorSetting(NotetypeSetting):
             tooltip=self.config.get("tooltip", None),
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
+    def _value_from_str(self, value_str: str) -> Any:
         # dont need to verify, because used in css and will be ignored if not valid
-        color_str = re.search(self.config["regex"], section).group(1)
-        return color_str
+        return value_str
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
+    def _value_to_str(self, setting_value: Any) -> str:
         if (
             self.config.get("with_inherit_option", False)
             and setting_value == "transparent"
         ):
-            setting_value_str = "inherit"
-        else:
-            setting_value_str = setting_value
-        return self._replace_first_capture_group(section, setting_value_str)
+            return "inherit"
+        return setting_value
 
 
-class ShortcutSetting(NotetypeSetting):
+class ShortcutSetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.shortcut_edit(
             key=self.key(model["name"]),
@@ -347,17 +554,15 @@ class ShortcutSetting(NotetypeSetting):
             tooltip=self.config.get("tooltip", None),
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
+    def _value_from_str(self, value_str: str) -> Any:
         # dont need to verify, because notetype js will ignore the shortcut if its invalid
-        shortcut_str = re.search(self.config["regex"], section).group(1)
-        return shortcut_str
+        return value_str
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
-        new_value_str = setting_value.replace('"', '\\"')
-        return self._replace_first_capture_group(section, new_value_str)
+    def _value_to_str(self, setting_value: Any) -> str:
+        return setting_value.replace('"', '\\"')
 
 
-class NumberEditSetting(NotetypeSetting):
+class NumberEditSetting(CaptureGroupSetting):
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.number_input(
             key=self.key(model["name"]),
@@ -369,8 +574,7 @@ class NumberEditSetting(NotetypeSetting):
             step=self.config.get("step", 1),
         )
 
-    def _extract_setting_value(self, section: str) -> Any:
-        value_str = re.search(self.config["regex"], section).group(1)
+    def _value_from_str(self, value_str: str) -> Any:
         try:
             if self.config.get("decimal", False):
                 result = float(value_str)
@@ -383,12 +587,17 @@ class NumberEditSetting(NotetypeSetting):
                 f"but found {value_str}"
             )
 
-    def _set_setting_value(self, section: str, setting_value: Any) -> str:
-        new_value_str = str(setting_value)
-        return self._replace_first_capture_group(section, new_value_str)
+    def _value_to_str(self, setting_value: Any) -> str:
+        return str(setting_value)
 
 
 class ElementOrderSetting(NotetypeSetting):
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self._elem_pattern = re.compile(config["elem_re"])
+        self._has_to_contain_pattern = re.compile(config["has_to_contain"])
+        self._name_pattern = re.compile(config["name_re"])
+
     def add_widget_to_config_layout(self, layout: ConfigLayout, model: "NotetypeDict"):
         layout.order_widget(
             key=self.key(model["name"]),
@@ -420,14 +629,16 @@ class ElementOrderSetting(NotetypeSetting):
         return result
 
     def _name_to_match_odict(self, section_text: str) -> OrderedDict[str, re.Match]:
+        # the patterns are applied to the span of each element in the section text
+        # so that the elements don't have to be copied out of it
         matches = [
             m
-            for m in re.finditer(self.config["elem_re"], str(section_text))
-            if re.search(self.config["has_to_contain"], m.group(0))
+            for m in self._elem_pattern.finditer(section_text)
+            if self._has_to_contain_pattern.search(section_text, *m.span())
         ]
         result = OrderedDict(
             [
-                (re.search(self.config["name_re"], m.group(0)).group(1), m)
+                (self._name_pattern.search(section_text, *m.span()).group(1), m)
                 for m in matches
             ]
         )
@@ -1,7 +1,9 @@
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, OrderedDict, Tuple, Union
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Tuple
 
 try:
     from anki.models import NotetypeDict  # pylint: disable=unused-import
@@ -15,521 +17,508 @@ ANKING_NOTETYPES_PATH = Path(__file__).parent / "note_types"
 # to be recognized by the add-on the field html needs to contain text matching the FIELD_HAS_TO_CONTAIN_RE
 # if something is a hint button or not is determined by its presence in the ButtonShortcuts dict
 # the surrounding "<!--" are needed because of the disable field setting
-CONDITIONAL_FIELD_RE = r"(?:<!-- ?)?\{\{#.+?\}\}[\w\W]+?\{\{/.+?\}\}(?: ?-->)?"
-CONFIGURABLE_FIELD_HAS_TO_CONTAIN_RE = (
+CONDITIONAL_FIELD_RE = re.compile(
+    r"(?:<!-- ?)?\{\{#.+?\}\}(?s:.+?)\{\{/.+?\}\}(?: ?-->)?"
+)
+CONFIGURABLE_FIELD_HAS_TO_CONTAIN_RE = re.compile(
     r'(class="hint"|id="extra"|id="dermnet"|id="ome")'
 )
-CONFIGURABLE_FIELD_NAME_RE = r"\{\{#(.+?)\}\}"
+CONFIGURABLE_FIELD_NAME_RE = re.compile(r"\{\{#(.+?)\}\}")
+
+BUTTON_SHORTCUTS_DICT_START_RE = re.compile(r"var+ ButtonShortcuts *= *{")
+BUTTON_SHORTCUTS_KEY_VALUE_RE = re.compile(r'"([^"]+)" *: *"([^"]*)"')
 
 
 # for matching text between double quotes which can contain
 # escaped quotes
-QUOT_STR_RE = r'(?:\\.|[^"\\])'
-
-
-setting_configs: Dict[str, Any] = OrderedDict(
-    {
-        "field_order": {
-            "text": "Field Order",
-            "tooltip": "drag and drop the field names to adjust their order",
-            "type": "order",
-            "file": "back",
-            "regex": r"[\w\W]*",
-            "elem_re": CONDITIONAL_FIELD_RE,
-            "name_re": CONFIGURABLE_FIELD_NAME_RE,
-            "has_to_contain": CONFIGURABLE_FIELD_HAS_TO_CONTAIN_RE,
-            "section": "Fields",
-        },
-        "toggle_next_button": {
-            "text": "Toggle next button shortcut",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +ToggleNextButtonShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Hint Buttons",
-            "default": "H",
-        },
-        "toggle_all_buttons": {
-            "text": "Toggle all buttons shortcut",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +ToggleAllButtonsShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Hint Buttons",
-            "default": "'",
-        },
-        "autoscroll_to_button": {
-            "text": "scroll to button when toggled",
-            "tooltip": "",
-            "type": "checkbox",
-            "file": "back",
-            "regex": r"var +ScrollToButton += +(false|true)",
-            "section": "Hint Buttons",
-            "default": True,
-        },
-        "io_reveal_next_shortcut": {
-            "text": "Image Occlusion Reveal Next",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +RevealIncrementalShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Image Occlusion",
-            "default": "N",
-        },
-        "io_toggle_all_shortcut": {
-            "text": "Image Occlusion Toggle All",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +ToggleAllOcclusionsShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Image Occlusion",
-            "default": ",",
-        },
-        "reveal_cloze_shortcut": {
-            "text": "Reveal Cloze Shortcut",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +revealNextShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Clozes",
-            "default": "N",
-        },
-        "reveal_cloze_word_shortcut": {
-            "text": "Reveal Cloze Word Shortcut",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +revealNextWordShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Clozes",
-            "default": "Shift+N",
-        },
-        "toggle_all_clozes_shortcut": {
-            "text": "Toggle all clozes shortcut",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +toggleAllShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Clozes",
-            "default": ",",
-        },
-        "reveal_next_cloze_mode": {
-            "text": "Reveal Next Cloze Mode",
-            "tooltip": "cloze: clozes are revealed normally\nword: clozes are revealed word by word",
-            "type": "dropdown",
-            "file": "back",
-            "regex": r'var +revealNextClozeMode += +"([^"]*?)"',
-            "options": ["cloze", "word"],
-            "section": "Clozes",
-            "default": "cloze",
-        },
-        "cloze_hider": {
-            "text": "Cloze Hider",
-            "tooltip": "Text that will displayed instead of the clozed text",
-            "type": "text",
-            "file": "back",
-            "regex": rf'var +clozeHider +=[^"]+"({QUOT_STR_RE}*?)"',
-            "section": "Clozes",
-            "default": "👑",
-        },
-        "timer": {
-            "text": "Timer",
-            "tooltip": "",
-            "type": "re_checkbox",
-            "file": "style",
-            "regex": r"\.timer *{[^}]*?display: (block|none);",
-            "replacement_pairs": [("none", "block")],
-            "section": "Timer",
-            "default": True,
-        },
-        "timer_secs": {
-            "text": "timer duration (seconds)",
-            "tooltip": "",
-            "type": "number",
-            "file": "front",
-            "regex": r"var +seconds += +([^ /\n]*)",
-            "min": 0,
-            "section": "Timer",
-            "default": 9,
-        },
-        "timer_minutes": {
-            "text": "timer duration (minutes)",
-            "tooltip": "",
-            "type": "number",
-            "file": "front",
-            "regex": r"var +minutes += +([^ /\n]*)",
-            "min": 0,
-            "section": "Timer",
-            "default": 0,
-        },
-        "autoflip": {
-            "text": "flip to back of card automatically\n(doesn't work on AnkiMobile)",
-            "tooltip": "",
-            "type": "checkbox",
-            "file": "front",
-            "regex": r"var +autoflip += +(false|true)",
-            "default": True,
-        },
-        "front_tts": {
-            "text": "Front TTS",
-            "tooltip": "",
-            "type": "re_checkbox",
-            "file": "front",
-            "regex": r"(<!--|{{)tts.+?(-->|}})",
-            "replacement_pairs": [("<!--", "{{"), ("-->", "}}")],
-            "section": "Text to Speech",
-            "default": False,
-        },
-        "front_tts_speed": {
-            "text": "Front TTS Speed",
-            "tooltip": "",
-            "type": "number",
-            "decimal": True,
-            "min": 0.1,
-            "max": 10,
-            "step": 0.1,
-            "file": "front",
-            "regex": r"(?:<!--|{{)tts.*?speed=([\d\.]+).*?(?:-->|}})",
-            "section": "Text to Speech",
-            "default": 1.4,
-        },
-        "back_tts": {
-            "text": "Back TTS",
-            "tooltip": """if you enable this and want to use the shortcut for revealing hint buttons one by one
+# (written as runs of plain characters separated by escape sequences, so that
+# the regex engine doesn't have to try the alternation for every character)
+QUOT_STR_RE = r'[^"\\]*(?:\\.[^"\\]*)*'
+
+
+# helpers for the regexes of settings that only differ in the variable name or css selector
+# (settings with the same regex share one compiled pattern because of re's pattern cache)
+def js_var_string_regex(var_name: str) -> str:
+    return rf'var +{re.escape(var_name)} += +"({QUOT_STR_RE})"'
+
+
+def js_var_bool_regex(var_name: str) -> str:
+    return rf"var +{re.escape(var_name)} += +(false|true)"
+
+
+def css_color_regex(selector: str, css_property: str = "color") -> str:
+    return rf"{re.escape(selector)} *{{[^}}]*?{re.escape(css_property)}: (.+?);"
+
+
+def css_important_color_regex(selector: str, css_property: str = "color") -> str:
+    return rf"{re.escape(selector)} *{{[^}}]*?{re.escape(css_property)}: (.+?)( +!important)?;"
+
+
+def css_var_regex(var_name: str) -> str:
+    return rf"{re.escape(var_name)}: +([^ ]*?);"
+
+
+# settings that are the same for all notetypes,
+# the settings for the configurable fields of the notetypes are added in _build_setting_configs
+_static_setting_configs: Dict[str, Any] = {
+    "field_order": {
+        "text": "Field Order",
+        "tooltip": "drag and drop the field names to adjust their order",
+        "type": "order",
+        "file": "back",
+        "regex": r"(?s:.*)",
+        "elem_re": CONDITIONAL_FIELD_RE,
+        "name_re": CONFIGURABLE_FIELD_NAME_RE,
+        "has_to_contain": CONFIGURABLE_FIELD_HAS_TO_CONTAIN_RE,
+        "section": "Fields",
+    },
+    "toggle_next_button": {
+        "text": "Toggle next button shortcut",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("ToggleNextButtonShortcut"),
+        "section": "Hint Buttons",
+        "default": "H",
+    },
+    "toggle_all_buttons": {
+        "text": "Toggle all buttons shortcut",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("ToggleAllButtonsShortcut"),
+        "section": "Hint Buttons",
+        "default": "'",
+    },
+    "autoscroll_to_button": {
+        "text": "scroll to button when toggled",
+        "tooltip": "",
+        "type": "checkbox",
+        "file": "back",
+        "regex": js_var_bool_regex("ScrollToButton"),
+        "section": "Hint Buttons",
+        "default": True,
+    },
+    "io_reveal_next_shortcut": {
+        "text": "Image Occlusion Reveal Next",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("RevealIncrementalShortcut"),
+        "section": "Image Occlusion",
+        "default": "N",
+    },
+    "io_toggle_all_shortcut": {
+        "text": "Image Occlusion Toggle All",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("ToggleAllOcclusionsShortcut"),
+        "section": "Image Occlusion",
+        "default": ",",
+    },
+    "reveal_cloze_shortcut": {
+        "text": "Reveal Cloze Shortcut",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("revealNextShortcut"),
+        "section": "Clozes",
+        "default": "N",
+    },
+    "reveal_cloze_word_shortcut": {
+        "text": "Reveal Cloze Word Shortcut",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("revealNextWordShortcut"),
+        "section": "Clozes",
+        "default": "Shift+N",
+    },
+    "toggle_all_clozes_shortcut": {
+        "text": "Toggle all clozes shortcut",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("toggleAllShortcut"),
+        "section": "Clozes",
+        "default": ",",
+    },
+    "reveal_next_cloze_mode": {
+        "text": "Reveal Next Cloze Mode",
+        "tooltip": "cloze: clozes are revealed normally\nword: clozes are revealed word by word",
+        "type": "dropdown",
+        "file": "back",
+        "regex": r'var +revealNextClozeMode += +"([^"]*?)"',
+        "options": ["cloze", "word"],
+        "section": "Clozes",
+        "default": "cloze",
+    },
+    "cloze_hider": {
+        "text": "Cloze Hider",
+        "tooltip": "Text that will displayed instead of the clozed text",
+        "type": "text",
+        "file": "back",
+        "regex": rf'var +clozeHider +=[^"]+"({QUOT_STR_RE})"',
+        "section": "Clozes",
+        "default": "👑",
+    },
+    "timer": {
+        "text": "Timer",
+        "tooltip": "",
+        "type": "re_checkbox",
+        "file": "style",
+        "regex": r"\.timer *{[^}]*?display: (block|none);",
+        "replacement_pairs": [("none", "block")],
+        "section": "Timer",
+        "default": True,
+    },
+    "timer_secs": {
+        "text": "timer duration (seconds)",
+        "tooltip": "",
+        "type": "number",
+        "file": "front",
+        "regex": r"var +seconds += +([^ /\n]*)",
+        "min": 0,
+        "section": "Timer",
+        "default": 9,
+    },
+    "timer_minutes": {
+        "text": "timer duration (minutes)",
+        "tooltip": "",
+        "type": "number",
+        "file": "front",
+        "regex": r"var +minutes += +([^ /\n]*)",
+        "min": 0,
+        "section": "Timer",
+        "default": 0,
+    },
+    "autoflip": {
+        "text": "flip to back of card automatically\n(doesn't work on AnkiMobile)",
+        "tooltip": "",
+        "type": "checkbox",
+        "file": "front",
+        "regex": js_var_bool_regex("autoflip"),
+        "default": True,
+    },
+    "front_tts": {
+        "text": "Front TTS",
+        "tooltip": "",
+        "type": "re_checkbox",
+        "file": "front",
+        "regex": r"(<!--|{{)tts.+?(-->|}})",
+        "replacement_pairs": [("<!--", "{{"), ("-->", "}}")],
+        "section": "Text to Speech",
+        "default": False,
+    },
+    "front_tts_speed": {
+        "text": "Front TTS Speed",
+        "tooltip": "",
+        "type": "number",
+        "decimal": True,
+        "min": 0.1,
+        "max": 10,
+        "step": 0.1,
+        "file": "front",
+        "regex": r"(?:<!--|{{)tts.*?speed=([\d\.]+).*?(?:-->|}})",
+        "section": "Text to Speech",
+        "default": 1.4,
+    },
+    "back_tts": {
+        "text": "Back TTS",
+        "tooltip": """if you enable this and want to use the shortcut for revealing hint buttons one by one
 you may have to change the \"Toggle next Button\" shortcut to something else than "H"
 (it is in the Hint Buttons section)""",
-            "type": "re_checkbox",
-            "file": "back",
-            "regex": r"(<!--|{{)tts.+?(-->|}})",
-            "replacement_pairs": [("<!--", "{{"), ("-->", "}}")],
-            "section": "Text to Speech",
-            "default": False,
-        },
-        "back_tts_speed": {
-            "text": "Back TTS Speed",
-            "tooltip": "",
-            "type": "number",
-            "decimal": True,
-            "min": 0.1,
-            "max": 10,
-            "step": 0.1,
-            "file": "back",
-            "regex": r"(?:<!--|{{)tts.*?speed=([\d\.]+).*?(?:-->|}})",
-            "section": "Text to Speech",
-            "default": 1.4,
-        },
-        "front_signal_tag": {
-            "text": "tag that will trigger red background for the front",
-            "tooltip": "",
-            "type": "text",
-            "file": "front",
-            "regex": rf'var +tagID += +"({QUOT_STR_RE}*?)"',
-            "section": "Tags",
-            "default": "XXXYYYZZZ",
-        },
-        "back_signal_tag": {
-            "text": "tag that will trigger red background for the back",
-            "tooltip": "",
-            "type": "text",
-            "file": "back",
-            "regex": rf'var +tagID += +"({QUOT_STR_RE}*?)"',
-            "section": "Tags",
-            "default": "XXXYYYZZZ",
-        },
-        "tags_container": {
-            "text": "Tags container",
-            "tooltip": "",
-            "type": "re_checkbox",
-            "file": "style",
-            "regex": r"\n#tags-container *{[^}]*?display: (block|none);",
-            "replacement_pairs": [("none", "block")],
-            "section": "Tags",
-            "default": True,
-        },
-        "tags_container_mobile": {
-            "text": "Tags container (mobile)",
-            "tooltip": "",
-            "type": "re_checkbox",
-            "file": "style",
-            "regex": r"\.mobile +#tags-container *{[^}]*?display: (block|none);",
-            "replacement_pairs": [("none", "block")],
-            "section": "Tags",
-            "default": False,
-        },
-        "tags_toggle_shortcut": {
-            "text": "Toggle Tags Shorcut",
-            "tooltip": "",
-            "type": "shortcut",
-            "file": "back",
-            "regex": rf'var +toggleTagsShortcut += +"({QUOT_STR_RE}*?)"',
-            "section": "Tags",
-            "default": "C",
-        },
-        "tags_num_levels_to_show_front": {
-            "text": "Number of tag levels to show on Front (0 means all)",
-            "type": "number",
-            "file": "front",
-            "regex": r"var +numTagLevelsToShow += +(\d+)",
-            "section": "Tags",
-            "default": 0,
-        },
-        "tags_num_levels_to_show_back": {
-            "text": "Number of tag levels to show on Back (0 means all)",
-            "type": "number",
-            "file": "back",
-            "regex": r"var +numTagLevelsToShow += +(\d+)",
-            "section": "Tags",
-            "default": 0,
-        },
-        "font_size": {
-            "text": "Font Size",
-            "tooltip": "",
-            "type": "number",
-            "file": "style",
-            "regex": r"html *{[^}]*?font-size: (\d+)px;",
-            "min": 1,
-            "max": 200,
-            "section": "Font",
-            "default": 28,
-        },
-        "font_size_mobile": {
-            "text": "Font Size (mobile)",
-            "tooltip": "",
-            "type": "number",
-            "file": "style",
-            "regex": r"\.mobile *{[^}]*?font-size: ([\d]+)px;",
-            "min": 1,
-            "max": 200,
-            "section": "Font",
-            "default": 28,
-        },
-        "font_family": {
-            "text": "Font Family",
-            "tooltip": "",
-            "type": "font_family",
-            "file": "style",
-            "regex": r"\.card.*\n*kbd *{[^}]*?font-family: (.+);",
-            "section": "Font",
-            "default": "Arial Greek, Arial",
-        },
-        "image_height": {
-            "text": "Max Image Height Percent",
-            "tooltip": "",
-            "type": "number",
-            "file": "style",
-            "regex": r"\nimg *{[^}]*?max-height: (.+)%;",
-            "max": 100,
-            "section": "Image Styling",
-            "default": 100,
-        },
-        "image_width": {
-            "text": "Max Image Width Percent",
-            "tooltip": "",
-            "type": "number",
-            "file": "style",
-            "regex": r"\nimg *{[^}]*?max-width: (.+)%;",
-            "max": 100,
-            "section": "Image Styling",
-            "default": 85,
-        },
-        "text_color": {
-            "text": "Default Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.card *{[^}]*?color: (.+?);",
-            "section": "Colors",
-            "default": "black",
-        },
-        "background_color": {
-            "text": "Background color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.card *{[^}]*?background-color: (.+?);",
-            "section": "Colors",
-            "default": "#D1CFCE",
-        },
-        "cloze_color": {
-            "text": "Cloze Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.cloze *{[^}]*?color: (.+?);",
-            "section": "Colors",
-            "default": "blue",
-        },
-        "extra_text_color": {
-            "text": "Extra Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"#extra *{[^}]*?color: (.+?);",
-            "section": "Colors",
-            "default": "navy",
-        },
-        "hint_text_color": {
-            "text": "Hint Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.hints *{[^}]*?color: (.+?);",
-            "section": "Colors",
-            "default": "#4297F9",
-        },
-        "missed_text_color": {
-            "text": "Missed Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"#missed *{[^}]*?color: (.+?);",
-            "section": "Colors",
-            "default": "red",
-        },
-        "timer_text_color": {
-            "text": "Timer Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.timer *{[^}]*?color: (.+?);",
-            "section": "Colors",
-            "default": "transparent",
-        },
-        "nm_text_color": {
-            "text": "Night Mode Text color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.night_mode \.card *{[^}]*?color: (.+?)( +!important)?;",
-            "section": "Colors",
-            "default": "#FFFAFA",
-        },
-        "nm_background_color": {
-            "text": "Night Mode Background color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.night_mode \.card *{[^}]*?background-color: (.+?)( +!important)?;",
-            "section": "Colors",
-            "default": "#272828",
-        },
-        "nm_cloze_color": {
-            "text": "Night Mode Cloze color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.night_mode \.cloze *{[^}]*?color: (.+?)( +!important)?;",
-            "section": "Colors",
-            "default": "#4297F9",
-        },
-        "nm_extra_color": {
-            "text": "Night Mode Extra color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.night_mode #extra *{[^}]*?color: (.+?)( +!important)?;",
-            "section": "Colors",
-            "default": "magenta",
-        },
-        "nm_hint_color": {
-            "text": "Night Mode Hint Reveal color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"\.night_mode \.hints *{[^}]*?color: (.+?)( +!important)?;",
-            "section": "Colors",
-            "default": "cyan",
-        },
-        "bold_text_color": {
-            "text": "Bold Text color",
-            "tooltip": "set to transparent for normal color",
-            "type": "color",
-            "file": "style",
-            "regex": r"b *{[^}]*?color: (.+?)( +!important)?;",
-            "with_inherit_option": True,
-            "section": "Colors",
-            "default": "inherit",
-        },
-        "underlined_text_color": {
-            "text": "Underlined Text color",
-            "tooltip": "set to transparent for normal color",
-            "type": "color",
-            "file": "style",
-            "regex": r"u *{[^}]*?color: (.+?)( +!important)?;",
-            "with_inherit_option": True,
-            "section": "Colors",
-            "default": "inherit",
-        },
-        "italic_text_color": {
-            "text": "Italic Text color",
-            "tooltip": "set to transparent for normal color",
-            "type": "color",
-            "file": "style",
-            "regex": r"i *{[^}]*?color: (.+?)( +!important)?;",
-            "with_inherit_option": True,
-            "section": "Colors",
-            "default": "inherit",
-        },
-        "image_occlusion_rect_color": {
-            "text": "Image Occlusion Rect Color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"--rect-bg: +([^ ]*?);",
-            "section": "Colors",
-            "default": "moccasin",
-        },
-        "image_occlusion_border_color": {
-            "text": "Image Occlusion Rect Border Color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"--rect-border: +([^ ]*?);",
-            "section": "Colors",
-            "default": "olive",
-        },
-        "image_occlusion_active_rect_color": {
-            "text": "Image Occlusion Active Rect Color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"--active-rect-bg: +([^ ]*?);",
-            "section": "Colors",
-            "default": "salmon",
-        },
-        "image_occlusion_active_border_color": {
-            "text": "Image Occlusion Active Rect Border Color",
-            "tooltip": "",
-            "type": "color",
-            "file": "style",
-            "regex": r"--active-rect-border: +([^ ]*?);",
-            "section": "Colors",
-            "default": "yellow",
-        },
+        "type": "re_checkbox",
+        "file": "back",
+        "regex": r"(<!--|{{)tts.+?(-->|}})",
+        "replacement_pairs": [("<!--", "{{"), ("-->", "}}")],
+        "section": "Text to Speech",
+        "default": False,
+    },
+    "back_tts_speed": {
+        "text": "Back TTS Speed",
+        "tooltip": "",
+        "type": "number",
+        "decimal": True,
+        "min": 0.1,
+        "max": 10,
+        "step": 0.1,
+        "file": "back",
+        "regex": r"(?:<!--|{{)tts.*?speed=([\d\.]+).*?(?:-->|}})",
+        "section": "Text to Speech",
+        "default": 1.4,
+    },
+    "front_signal_tag": {
+        "text": "tag that will trigger red background for the front",
+        "tooltip": "",
+        "type": "text",
+        "file": "front",
+        "regex": js_var_string_regex("tagID"),
+        "section": "Tags",
+        "default": "XXXYYYZZZ",
+    },
+    "back_signal_tag": {
+        "text": "tag that will trigger red background for the back",
+        "tooltip": "",
+        "type": "text",
+        "file": "back",
+        "regex": js_var_string_regex("tagID"),
+        "section": "Tags",
+        "default": "XXXYYYZZZ",
+    },
+    "tags_container": {
+        "text": "Tags container",
+        "tooltip": "",
+        "type": "re_checkbox",
+        "file": "style",
+        "regex": r"\n#tags-container *{[^}]*?display: (block|none);",
+        "replacement_pairs": [("none", "block")],
+        "section": "Tags",
+        "default": True,
+    },
+    "tags_container_mobile": {
+        "text": "Tags container (mobile)",
+        "tooltip": "",
+        "type": "re_checkbox",
+        "file": "style",
+        "regex": r"\.mobile +#tags-container *{[^}]*?display: (block|none);",
+        "replacement_pairs": [("none", "block")],
+        "section": "Tags",
+        "default": False,
+    },
+    "tags_toggle_shortcut": {
+        "text": "Toggle Tags Shorcut",
+        "tooltip": "",
+        "type": "shortcut",
+        "file": "back",
+        "regex": js_var_string_regex("toggleTagsShortcut"),
+        "section": "Tags",
+        "default": "C",
+    },
+    "tags_num_levels_to_show_front": {
+        "text": "Number of tag levels to show on Front (0 means all)",
+        "type": "number",
+        "file": "front",
+        "regex": r"var +numTagLevelsToShow += +(\d+)",
+        "section": "Tags",
+        "default": 0,
+    },
+    "tags_num_levels_to_show_back": {
+        "text": "Number of tag levels to show on Back (0 means all)",
+        "type": "number",
+        "file": "back",
+        "regex": r"var +numTagLevelsToShow += +(\d+)",
+        "section": "Tags",
+        "default": 0,
+    },
+    "font_size": {
+        "text": "Font Size",
+        "tooltip": "",
+        "type": "number",
+        "file": "style",
+        "regex": r"html *{[^}]*?font-size: (\d+)px;",
+        "min": 1,
+        "max": 200,
+        "section": "Font",
+        "default": 28,
+    },
+    "font_size_mobile": {
+        "text": "Font Size (mobile)",
+        "tooltip": "",
+        "type": "number",
+        "file": "style",
+        "regex": r"\.mobile *{[^}]*?font-size: ([\d]+)px;",
+        "min": 1,
+        "max": 200,
+        "section": "Font",
+        "default": 28,
+    },
+    "font_family": {
+        "text": "Font Family",
+        "tooltip": "",
+        "type": "font_family",
+        "file": "style",
+        "regex": r"\.card.*\n*kbd *{[^}]*?font-family: (.+);",
+        "section": "Font",
+        "default": "Arial Greek, Arial",
+    },
+    "image_height": {
+        "text": "Max Image Height Percent",
+        "tooltip": "",
+        "type": "number",
+        "file": "style",
+        "regex": r"\nimg *{[^}]*?max-height: (.+)%;",
+        "max": 100,
+        "section": "Image Styling",
+        "default": 100,
+    },
+    "image_width": {
+        "text": "Max Image Width Percent",
+        "tooltip": "",
+        "type": "number",
+        "file": "style",
+        "regex": r"\nimg *{[^}]*?max-width: (.+)%;",
+        "max": 100,
+        "section": "Image Styling",
+        "default": 85,
+    },
+}
+
+# color settings that only differ in their name, text, css selector and default,
+# they are added to the end of _static_setting_configs by _color_setting_configs
+# (name, text, css selector, css property, default)
+_COLOR_SETTINGS = [
+    ("text_color", "Default Text color", ".card", "color", "black"),
+    ("background_color", "Background color", ".card", "background-color", "#D1CFCE"),
+    ("cloze_color", "Cloze Text color", ".cloze", "color", "blue"),
+    ("extra_text_color", "Extra Text color", "#extra", "color", "navy"),
+    ("hint_text_color", "Hint Text color", ".hints", "color", "#4297F9"),
+    ("missed_text_color", "Missed Text color", "#missed", "color", "red"),
+    ("timer_text_color", "Timer Text color", ".timer", "color", "transparent"),
+]
+
+# (name, text, css selector, css property, default)
+_NIGHT_MODE_COLOR_SETTINGS = [
+    ("nm_text_color", "Night Mode Text color", ".night_mode .card", "color", "#FFFAFA"),
+    (
+        "nm_background_color",
+        "Night Mode Background color",
+        ".night_mode .card",
+        "background-color",
+        "#272828",
+    ),
+    (
+        "nm_cloze_color",
+        "Night Mode Cloze color",
+        ".night_mode .cloze",
+        "color",
+        "#4297F9",
+    ),
+    (
+        "nm_extra_color",
+        "Night Mode Extra color",
+        ".night_mode #extra",
+        "color",
+        "magenta",
+    ),
+    (
+        "nm_hint_color",
+        "Night Mode Hint Reveal color",
+        ".night_mode .hints",
+        "color",
+        "cyan",
+    ),
+]
+
+# colors of formatted text, they can be set to inherit the color of the surrounding text
+# (name, text, css selector)
+_TEXT_FORMATTING_COLOR_SETTINGS = [
+    ("bold_text_color", "Bold Text color", "b"),
+    ("underlined_text_color", "Underlined Text color", "u"),
+    ("italic_text_color", "Italic Text color", "i"),
+]
+
+# (name, text, css variable, default)
+_IMAGE_OCCLUSION_COLOR_SETTINGS = [
+    (
+        "image_occlusion_rect_color",
+        "Image Occlusion Rect Color",
+        "--rect-bg",
+        "moccasin",
+    ),
+    (
+        "image_occlusion_border_color",
+        "Image Occlusion Rect Border Color",
+        "--rect-border",
+        "olive",
+    ),
+    (
+        "image_occlusion_active_rect_color",
+        "Image Occlusion Active Rect Color",
+        "--active-rect-bg",
+        "salmon",
+    ),
+    (
+        "image_occlusion_active_border_color",
+        "Image Occlusion Active Rect Border Color",
+        "--active-rect-border",
+        "yellow",
+    ),
+]
+
+
+def color_setting_config(
+    text: str, regex: str, default: str, tooltip: str = ""
+) -> Dict:
+    return {
+        "text": text,
+        "tooltip": tooltip,
+        "type": "color",
+        "file": "style",
+        "regex": regex,
+        "section": "Colors",
+        "default": default,
     }
-)
+
+
+def _color_setting_configs() -> Dict[str, Any]:
+    result = dict()
+    for name, text, selector, css_property, default in _COLOR_SETTINGS:
+        result[name] = color_setting_config(
+            text, css_color_regex(selector, css_property), default
+        )
+
+    for name, text, selector, css_property, default in _NIGHT_MODE_COLOR_SETTINGS:
+        result[name] = color_setting_config(
+            text, css_important_color_regex(selector, css_property), default
+        )
+
+    for name, text, selector in _TEXT_FORMATTING_COLOR_SETTINGS:
+        result[name] = {
+            **color_setting_config(
+                text,
+                css_important_color_regex(selector),
+                "inherit",
+                tooltip="set to transparent for normal color",
+            ),
+            "with_inherit_option": True,
+        }
+
+    for name, text, css_var_name, default in _IMAGE_OCCLUSION_COLOR_SETTINGS:
+        result[name] = color_setting_config(text, css_var_regex(css_var_name), default)
+
+    return result
+
+
+_static_setting_configs.update(_color_setting_configs())
 
 
 def anking_notetype_names():
     return list(anking_notetype_templates().keys())
 
 
-def anking_notetype_templates() -> Dict[str, Tuple[str, str, str]]:
+# the bundled notetype files don't change while Anki is running, so they are only read once
+# (the mapping is read-only because every caller gets the same cached object)
+@lru_cache(maxsize=1)
+def anking_notetype_templates() -> Mapping[str, Tuple[str, str, str]]:
     result = dict()
     for x in ANKING_NOTETYPES_PATH.iterdir():
-        if not x.is_dir():
+        # directories without templates are not notetypes
+        if not (x / "Back Template.html").is_file():
             continue
         notetype_name = x.name
 
         front_template = (x / "Front Template.html").read_text(
             encoding="utf-8", errors="ignore"
         )
-        back_template = (x / ("Back Template.html")).read_text(
+        back_template = (x / "Back Template.html").read_text(
             encoding="utf-8", errors="ignore"
         )
-        styling = (x / ("Styling.css")).read_text(encoding="utf-8", errors="ignore")
+        styling = (x / "Styling.css").read_text(encoding="utf-8", errors="ignore")
         result[notetype_name] = (front_template, back_template, styling)
 
-    return result
+    return MappingProxyType(result)
 
 
 def anking_notetype_model(notetype_name: str) -> "NotetypeDict":
@@ -544,63 +533,104 @@ def anking_notetype_model(notetype_name: str) -> "NotetypeDict":
 
 
 def all_btns_setting_configs():
-    result = OrderedDict()
+    result = dict()
     for notetype_name in anking_notetype_templates().keys():
+        btn_name_to_shortcut = btn_name_to_shortcut_odict(notetype_name)
         for field_name in configurable_fields_for_notetype(notetype_name):
-            shortcut = btn_name_to_shortcut_odict(notetype_name).get(field_name, None)
-            result.update(configurable_field_configs(field_name, shortcut))
+            if field_name in btn_name_to_shortcut:
+                result.update(
+                    _hint_button_configs(field_name, btn_name_to_shortcut[field_name])
+                )
+            else:
+                result.update(_plain_field_configs(field_name))
     return result
 
 
-def configurable_fields_for_notetype(notetype_name: str) -> List[str]:
+# only depends on the bundled back template of the notetype, so it is computed once per notetype
+@lru_cache(maxsize=None)
+def configurable_fields_for_notetype(notetype_name: str) -> Tuple[str, ...]:
     _, back, _ = anking_notetype_templates()[notetype_name]
 
-    return [
-        re.search(CONFIGURABLE_FIELD_NAME_RE, field).group(1)
-        for field in re.findall(CONDITIONAL_FIELD_RE, back)
-        if re.search(CONFIGURABLE_FIELD_HAS_TO_CONTAIN_RE, field)
-    ]
+    return tuple(
+        field_name
+        for field_name, content_start, content_end in _iter_conditional_fields(back)
+        if CONFIGURABLE_FIELD_HAS_TO_CONTAIN_RE.search(back, content_start, content_end)
+    )
 
 
-def btn_name_to_shortcut_odict(notetype_name):
+def _iter_conditional_fields(text: str) -> Iterator[Tuple[str, int, int]]:
+    # yields (field name, start of content, end of content) for the blocks that
+    # CONDITIONAL_FIELD_RE would match, using str.find instead of the regex
+    # (which has to try to end the lazy match at every character of the content)
+    find = text.find
+    pos = 0
+    while True:
+        start = find("{{#", pos)
+        if start == -1:
+            return
+        name_end = find("}}", start + 4)
+        if name_end == -1:
+            return
+        name = text[start + 3 : name_end]
+        if "\n" in name:
+            pos = start + 3
+            continue
+
+        # the content ends at the first closing tag of any name, like in the regex
+        close = find("{{/", name_end + 3)
+        while close != -1:
+            close_end = find("}}", close + 4)
+            if close_end == -1:
+                return
+            if "\n" not in text[close + 3 : close_end]:
+                break
+            close = find("{{/", close + 3)
+        if close == -1:
+            return
+
+        yield name, name_end + 2, close
+        pos = close_end + 2
+
+
+# the ButtonShortcuts dict of each notetype is parsed once, callers share the read-only result
+@lru_cache(maxsize=None)
+def btn_name_to_shortcut_odict(notetype_name: str) -> Mapping[str, str]:
     _, back, _ = anking_notetype_templates()[notetype_name]
 
-    button_shortcuts_dict_pattern = r"var+ ButtonShortcuts *= *{([^}]*)}"
-    m = re.search(button_shortcuts_dict_pattern, back)
+    m = BUTTON_SHORTCUTS_DICT_START_RE.search(back)
     if not m:
-        return dict()
-
-    result = OrderedDict()
-    dict_key_value_pattern = r'"([^"]+)" *: *"([^"]*)"'
-    button_shorcut_pairs = re.findall(dict_key_value_pattern, m.group(1))
-    for btn_name, shortcut in button_shorcut_pairs:
-        result[btn_name] = shortcut
-    return result
+        return MappingProxyType(dict())
+    dict_end = back.find("}", m.end())
+    if dict_end == -1:
+        return MappingProxyType(dict())
+
+    # the key value pairs are searched in the dict without copying it out of the template
+    button_shorcut_pairs = BUTTON_SHORTCUTS_KEY_VALUE_RE.findall(
+        back, m.end(), dict_end
+    )
+    return MappingProxyType(dict(button_shorcut_pairs))
 
 
-def configurable_field_configs(
-    name: str, default_shortcut_if_hint_button: Union[str, None]
-) -> Dict:
-    # if default_shortcut_if_hint_button is None, then this function assumes that
-    # the configurable field is not a hint button
+# configs for configurable fields that are not hint buttons
+def _plain_field_configs(name: str) -> Dict:
     name_in_snake_case = name.lower().replace(" ", "_")
-    result = {
+    return {
         f"disable_{name_in_snake_case}": disable_field_setting_config(name, False),
     }
 
-    if default_shortcut_if_hint_button is not None:
-        result.update(
-            {
-                f"btn_shortcut_{name_in_snake_case}": button_shortcut_setting_config(
-                    name, default_shortcut_if_hint_button
-                ),
-                f"autoreveal_{name_in_snake_case}": button_auto_reveal_setting_config(
-                    name, False
-                ),
-            }
-        )
 
-    return result
+# configs for configurable fields that are hint buttons
+def _hint_button_configs(name: str, default_shortcut: str) -> Dict:
+    name_in_snake_case = name.lower().replace(" ", "_")
+    return {
+        **_plain_field_configs(name),
+        f"btn_shortcut_{name_in_snake_case}": button_shortcut_setting_config(
+            name, default_shortcut
+        ),
+        f"autoreveal_{name_in_snake_case}": button_auto_reveal_setting_config(
+            name, False
+        ),
+    }
 
 
 def button_shortcut_setting_config(field_name: str, default) -> Dict:
@@ -608,7 +638,7 @@ def button_shortcut_setting_config(field_name: str, default) -> Dict:
         "text": f"{field_name} Shortcut",
         "type": "shortcut",
         "file": "back",
-        "regex": rf'var+ ButtonShortcuts *= *{{[^}}]*?"{field_name}" *: *"({QUOT_STR_RE}*?)"',
+        "regex": rf'var+ ButtonShortcuts *= *{{[^}}]*?"{re.escape(field_name)}" *: *"({QUOT_STR_RE})"',
         "configurable_field_name": field_name,
         "section": "Hint Buttons",
         "default": default,
@@ -620,7 +650,7 @@ def button_auto_reveal_setting_config(field_name, default):
         "text": f"Auto Reveal {field_name}",
         "type": "checkbox",
         "file": "back",
-        "regex": rf'var+ ButtonAutoReveal *= *{{[^}}]*?"{field_name}" *: *(.+),\n',
+        "regex": rf'var+ ButtonAutoReveal *= *{{[^}}]*?"{re.escape(field_name)}" *: *(.+),\n',
         "configurable_field_name": field_name,
         "section": "Hint Buttons",
         "default": default,
@@ -633,17 +663,33 @@ def disable_field_setting_config(field_name, default):
         "tooltip": "",
         "type": "wrap_checkbox",
         "file": "back",
-        "regex": rf"(<!--)?{{{{#{field_name}}}}}[\w\W]+?{{{{/{field_name}}}}}(-->)?",
+        "regex": rf"(<!--)?{{{{#{re.escape(field_name)}}}}}(?s:.+?){{{{/{re.escape(field_name)}}}}}(-->)?",
         "wrap_into": ("<!--", "-->"),
         "section": "Fields",
         "default": default,
     }
 
 
-setting_configs = OrderedDict(**setting_configs, **all_btns_setting_configs())
+# building the configs for the configurable fields requires reading and searching all bundled
+# templates, so it is done on first access of setting_configs and not on import
+# (to not slow down Anki's startup), see __getattr__
+@lru_cache(maxsize=1)
+def _build_setting_configs() -> Dict[str, Any]:
+    # builds the dict in one pass and adds the names of the settings to their configs
+    result = dict()
+    for configs in (_static_setting_configs, all_btns_setting_configs()):
+        for setting_name, setting_config in configs.items():
+            assert setting_name not in result, f"duplicate setting: {setting_name}"
+            setting_config["name"] = setting_name
+            result[setting_name] = setting_config
+    return result
+
+
+def __getattr__(name: str) -> Any:
+    if name == "setting_configs":
+        return _build_setting_configs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-for setting_name, setting_config in setting_configs.items():
-    setting_config["name"] = setting_name
 
 # settings that apply to multiple note types
 # (the ones that have this setting listed in
@@ -699,8 +745,11 @@ general_settings = [
 ]
 
 
-def general_settings_defaults_dict():
+# the defaults don't change, so the dict is only built once (and shared read-only)
+@lru_cache(maxsize=1)
+def general_settings_defaults_dict() -> Mapping[str, Any]:
     result = dict()
     for setting_name in general_settings:
-        result[setting_name] = setting_configs[setting_name]["default"]
-    return result
+        # general settings are all static, so this doesn't build setting_configs
+        result[setting_name] = _static_setting_configs[setting_name]["default"]
+    return MappingProxyType(result)
@@ -0,0 +1,102 @@
+# the lazy tab population is internal to NotetypesConfigWindow and has no public entry
+# points that work without a running Anki, so the tests call its private methods
+# pylint: disable=protected-access
+import unittest
+from copy import deepcopy
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.anking_notetypes.ankiaddonconfig import ConfigManager
+from src.anking_notetypes.gui.config_window import NotetypesConfigWindow, ntss_for_model
+from src.anking_notetypes.notetype_setting_definitions import (
+    anking_notetype_model,
+    anking_notetype_names,
+)
+
+
+class TestConfigWindowLazyTabs(unittest.TestCase):
+    def setUp(self):
+        self.notetype_name = sorted(anking_notetype_names())[0]
+        self.model = anking_notetype_model(self.notetype_name)
+        self.model["id"] = 1
+
+        # a collection that only contains self.model
+        self.mw = MagicMock()
+        self.mw.col.models.all_names_and_ids.return_value = [
+            SimpleNamespace(name=self.notetype_name, id=1)
+        ]
+        self.mw.col.models.get.side_effect = lambda id: (
+            self.model if id == 1 else None
+        )
+        self.mw.col.models.by_name.side_effect = lambda name: (
+            self.model if name == self.notetype_name else None
+        )
+        self.mw.addonManager.getConfig.return_value = dict()
+
+        for target in (
+            "src.anking_notetypes.gui.config_window.mw",
+            "src.anking_notetypes.ankiaddonconfig.manager.mw",
+        ):
+            patcher = patch(target, self.mw)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.window = NotetypesConfigWindow()
+        self.window.conf = ConfigManager()
+        self.window.window = MagicMock()
+        self.window.window.add_tab.side_effect = lambda tab_name: MagicMock()
+        self.window.window.main_tab.count.side_effect = (
+            lambda: len(self.window.tab_idx_by_name) + 1
+        )
+
+    def test_settings_of_tab_that_was_never_shown_are_saved(self):
+        self.window._read_in_settings()
+        for notetype_name in sorted(self.window.notetype_names):
+            self.window._add_notetype_settings_tab(notetype_name, self.window.window)
+        self.assertIn(self.notetype_name, self.window.tabs_to_populate)
+
+        nts = next(
+            nts
+            for nts in ntss_for_model(self.model)
+            if nts.config["type"] == "checkbox"
+        )
+        key = nts.key(self.notetype_name)
+        new_value = not self.window.conf.get(key)
+        self.window.conf.set(key, new_value)
+
+        model_before = deepcopy(self.model)
+        changed_models = self.window._apply_setting_changes_for_all_notetypes()
+
+        # the tab was never shown, so its widgets were never created
+        self.assertIn(self.notetype_name, self.window.tabs_to_populate)
+        self.assertEqual(len(changed_models), 1)
+        self.assertEqual(nts.setting_value(changed_models[0]), new_value)
+        # the cached model of the collection is not changed by the background task
+        self.assertEqual(self.model, model_before)
+
+    def test_reload_tabs_requeues_tabs(self):
+        shown_name, not_shown_name = sorted(self.window.notetype_names)[:2]
+        shown_tab = self.window._add_tab(shown_name, self.window.window)
+        self.window._add_notetype_settings_tab(not_shown_name, self.window.window)
+        not_shown_tab = self.window.tabs_to_populate[not_shown_name]
+
+        with patch.object(
+            self.window, "_read_in_settings_for"
+        ) as read_in_settings_for, patch.object(
+            self.window, "_populate_notetype_settings_tab"
+        ) as populate_tab:
+            self.window._reload_tabs(
+                [shown_name, not_shown_name], active_tab_name=not_shown_name
+            )
+
+            read_in_settings_for.assert_called_once_with([shown_name, not_shown_name])
+            # the tab that wasn't shown yet is kept and populated because it is active now
+            populate_tab.assert_called_once_with(not_shown_name, not_shown_tab)
+
+        # the shown tab was replaced by a new tab that is populated when it is shown
+        self.assertEqual(list(self.window.tabs_to_populate), [shown_name])
+        self.assertIsNot(self.window.tabs_to_populate[shown_name], shown_tab)
+        self.assertEqual(
+            sorted(self.window.tab_idx_by_name.values()),
+            list(range(len(self.window.tab_idx_by_name))),
+        )
@@ -6,6 +6,7 @@ from pathlib import Path
 from src.anking_notetypes.gui.config_window import ntss_for_model
 from src.anking_notetypes.notetype_setting import (  # pylint: disable=unused-import
     NotetypeSetting,
+    update_model_settings,
 )
 from src.anking_notetypes.notetype_setting_definitions import (
     anking_notetype_model,
@@ -49,6 +50,73 @@ class TestNotetypeSettingManipulation(unittest.TestCase):
                         msg=f"{model['name']}.{nts.config['name']}",
                     )
 
+    def test_notetype_manipulation_multiple_settings(self):
+        for notetype_name, model in (
+            (name, anking_notetype_model(name)) for name in anking_notetype_names()
+        ):
+            ntss = ntss_for_model(model)
+            for i in range(2):
+                # change all settings of the notetype at once
+                temp_conf = config(model)
+                for nts in ntss:
+                    test_values = _test_values(nts, model)
+                    temp_conf[nts.key(notetype_name)] = test_values[
+                        i % len(test_values)
+                    ]
+                temp_model = deepcopy(model)
+                exceptions = update_model_settings(
+                    temp_model, temp_model["name"], ntss, temp_conf
+                )
+
+                self.assertEqual(exceptions, [], msg=model["name"])
+                self.assertDictEqual(config(temp_model), temp_conf, msg=model["name"])
+
+    def test_update_model_settings_same_as_updating_settings_one_by_one(self):
+        for notetype_name, model in (
+            (name, anking_notetype_model(name)) for name in anking_notetype_names()
+        ):
+            ntss = ntss_for_model(model)
+            for change_order in (False, True):
+                for i in range(2):
+                    temp_conf = config(model)
+                    for nts in ntss:
+                        # the order setting changes the whole section it belongs to, so the
+                        # other settings of the template are only applied in one batch
+                        # if it is left unchanged
+                        if nts.config["type"] == "order" and not change_order:
+                            continue
+                        test_values = _test_values(nts, model)
+                        temp_conf[nts.key(notetype_name)] = test_values[
+                            i % len(test_values)
+                        ]
+
+                    batch_model = deepcopy(model)
+                    exceptions = update_model_settings(
+                        batch_model, notetype_name, ntss, temp_conf
+                    )
+                    self.assertEqual(exceptions, [], msg=model["name"])
+
+                    sequential_model = deepcopy(model)
+                    for nts in ntss:
+                        sequential_model = nts.updated_model(
+                            sequential_model, notetype_name, temp_conf
+                        )
+
+                    msg = f"{model['name']} change_order={change_order} i={i}"
+                    self.assertEqual(
+                        batch_model["tmpls"][0]["qfmt"],
+                        sequential_model["tmpls"][0]["qfmt"],
+                        msg=msg,
+                    )
+                    self.assertEqual(
+                        batch_model["tmpls"][0]["afmt"],
+                        sequential_model["tmpls"][0]["afmt"],
+                        msg=msg,
+                    )
+                    self.assertEqual(
+                        batch_model["css"], sequential_model["css"], msg=msg
+                    )
+
 
 def config(model: "NotetypeDict"):
     result = dict()